@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import sqlite3
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from f1_downloader.models import CacheEntry
+from f1_downloader.utils import atomic_write, json_dumps, json_loads
 
 
-# Default cache structure with schema documentation
+# Default cache structure with schema documentation.
+# The schema is documentation only: the file stores just its version.
 DEFAULT_CACHE: dict[str, Any] = {
     "_schema": {
         "version": 1,
@@ -33,54 +39,169 @@ DEFAULT_CACHE: dict[str, Any] = {
 
 
 class CircuitCache:
-    """Manages circuit ID mappings cache."""
+    """
+    Manages circuit ID mappings cache.
+
+    The JSON file is the compacted snapshot (and stays hand-editable).
+    Mutations are appended to an NDJSON journal next to it and folded back
+    into the snapshot by compact(), so each processed circuit costs one
+    small append instead of a full-file rewrite.
+    """
 
     def __init__(self, path: Path, logger: logging.Logger) -> None:
         self.path = path
         self.logger = logger
-
-        self._data: dict[str, Any] = DEFAULT_CACHE.copy()
+        self.journal_path = path.with_suffix(".ndjson")
+
+        self._data: dict[str, Any] = copy.deepcopy(DEFAULT_CACHE)
+        self._journal_lines = 0
+        self._fp: BinaryIO | None = None
+        self._torn_tail = False  # Journal doesn't end with a newline (crash mid-write)
+        self._dirty = False
+        self._lock = threading.RLock()  # Circuits are processed in parallel
         self._load()
+        self._replay_journal()
 
     def _load(self) -> None:
-        """Load cache from file."""
+        """Load cache snapshot from file."""
 
         if self.path.exists():
             try:
-                with open(self.path, encoding="utf-8") as f:
-                    data = json.load(f)
-                    self._data = {**DEFAULT_CACHE, **data}
-
-                    if "circuits" not in self._data:
-                        self._data["circuits"] = {}
+                with open(self.path, "rb") as f:
+                    data = json_loads(f.read())
+                    self._data["circuits"] = data.get("circuits") or {}
 
             except (json.JSONDecodeError, OSError) as e:
-                self.logger.warning(f"Failed to load cache: {e}")
+                self.logger.warning("Failed to load cache: %s", e)
 
-                self._data = DEFAULT_CACHE.copy()
-        else:
-            self._data = DEFAULT_CACHE.copy()
-            self.save()  # Create file with schema
+                self._data = copy.deepcopy(DEFAULT_CACHE)
 
-    def save(self) -> None:
-        """Save cache to file."""
+        # Direct reference for lookups + case-insensitive name index
+        self._circuits: dict[str, dict[str, Any]] = self._data["circuits"]
+        self._lower_index = {name.lower(): name for name in self._circuits}
+
+        if not self.path.exists():
+            atomic_write(self._snapshot(), self.path, self.logger)  # Create empty file
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Data written to the cache file (without schema documentation)."""
+
+        return {
+            "_schema_version": self._data["_schema"]["version"],
+            "circuits": self._circuits,
+        }
+
+    def _replay_journal(self) -> None:
+        """Apply journal records left over from a previous run."""
+
+        if not self.journal_path.exists():
+            return
 
         try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    self._torn_tail = not line.endswith(b"\n")
+
+                    if not line.strip():
+                        continue
+
+                    try:
+                        rec = json_loads(line)
+                    except json.JSONDecodeError:
+                        rec = None
+
+                    if not (isinstance(rec, dict) and isinstance(rec.get("name"), str)):
+                        # Torn last line after a crash - keep what we have
+                        self.logger.warning("Skipping corrupt cache journal record")
+                        continue
+
+                    name = rec.pop("name")
+                    self._circuits[name] = rec
+                    self._lower_index.setdefault(name.lower(), name)
+                    self._journal_lines += 1
 
         except OSError as e:
-            self.logger.warning(f"Failed to save cache: {e}")
+            self.logger.warning("Failed to read cache journal: %s", e)
 
-    def get(self, name: str) -> CacheEntry | None:
-        """Get cached entry for circuit name."""
+    def _append(self, name: str) -> None:
+        """Append current state of a circuit to the journal."""
 
-        circuits = self._data.get("circuits", {})
+        with self._lock:
+            record = {"name": name, **self._circuits[name]}
 
-        if name in circuits:
-            return CacheEntry.from_dict(circuits[name])
+            try:
+                if self._fp is None:
+                    self._fp = open(self.journal_path, "ab", buffering=1 << 16)
+
+                    # Don't glue the first record onto a torn line, both would be lost
+                    if self._torn_tail:
+                        self._fp.write(b"\n")
+                        self._torn_tail = False
+
+                self._fp.write(json_dumps(record) + b"\n")
+                self._journal_lines += 1
+                self._dirty = True
+
+            except OSError as e:
+                self.logger.warning("Failed to write cache journal: %s", e)
+
+    def flush(self) -> None:
+        """Write buffered journal records to disk if anything changed."""
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            if self._journal_lines > 2 * len(self._circuits):
+                self.compact()
+                return
+
+            if self._fp is not None:
+                try:
+                    self._fp.flush()
+                except OSError as e:
+                    self.logger.warning("Failed to write cache journal: %s", e)
 
-        return None
+            self._dirty = False
+
+    def compact(self) -> None:
+        """Fold the journal into the JSON snapshot and remove it."""
+
+        with self._lock:
+            if self._journal_lines == 0:
+                return
+
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+            if not atomic_write(self._snapshot(), self.path, self.logger):
+                self.logger.warning("Failed to save cache, keeping journal")
+                return
+
+            self.journal_path.unlink(missing_ok=True)
+            self._journal_lines = 0
+            self._dirty = False
+
+    def save(self) -> None:
+        """Save cache to file (called once at shutdown)."""
+
+        self.compact()
+
+    def _resolve(self, name: str) -> str:
+        """Return the stored key for name: exact match, else case-insensitive, else name."""
+
+        if name in self._circuits:
+            return name
+
+        return self._lower_index.get(name.lower(), name)
+
+    def get(self, name: str) -> CacheEntry | None:
+        """Get cached entry for circuit name (falls back to case-insensitive match)."""
+
+        entry = self._circuits.get(self._resolve(name))
+
+        return CacheEntry.from_dict(entry) if entry else None
 
     def set(
         self,
@@ -95,13 +216,12 @@ class CircuitCache:
         """
         Save circuit to cache.
 
-        Won't overwrite entries marked as manual.
+        Won't overwrite entries marked as manual. An existing entry whose
+        name differs only in case is updated instead of adding a new one.
         """
 
-        if "circuits" not in self._data:
-            self._data["circuits"] = {}
-
-        existing = self._data["circuits"].get(name, {})
+        name = self._resolve(name)
+        existing = self._circuits.get(name, {})
 
         if existing.get("manual"):
             return
@@ -126,25 +246,86 @@ class CircuitCache:
             if wikidata_id:
                 entry.comment += f" (check https://www.wikidata.org/wiki/{wikidata_id})"
 
-        self._data["circuits"][name] = entry.to_dict()
-        self.save()
+        with self._lock:
+            self._circuits[name] = entry.to_dict()
+            self._lower_index.setdefault(name.lower(), name)
+            self._append(name)
 
     def update_version(self, name: str, version: int) -> None:
         """Update OSM version for a circuit."""
 
-        if "circuits" not in self._data:
-            return
+        with self._lock:
+            name = self._resolve(name)
 
-        if name in self._data["circuits"]:
-            self._data["circuits"][name]["osm_version"] = version
-            self.save()
+            if name in self._circuits:
+                self._circuits[name]["osm_version"] = version
+                self._append(name)
 
     @property
     def stats(self) -> tuple[int, int]:
         """Return (manual_count, auto_count) statistics."""
 
-        circuits = self._data.get("circuits", {})
+        circuits = self._circuits
         manual = sum(1 for c in circuits.values() if c.get("manual"))
         auto = len(circuits) - manual
 
         return manual, auto
+
+
+class DiskCache:
+    """
+    Persistent key-value store (SQLite) with per-entry expiry.
+
+    Values must be JSON-serializable. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value for key, or default if missing or expired."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return default
+
+            value, expires_at = row
+
+            if expires_at is not None and expires_at < time.time():
+                with self._conn:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+                return default
+
+        return json_loads(value)
+
+    def set(self, key: str, value: Any, expire: float | None = None) -> None:
+        """Store value, optionally expiring after `expire` seconds."""
+
+        expires_at = time.time() + expire if expire is not None else None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json_dumps(value), expires_at),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
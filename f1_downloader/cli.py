@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import logging
+import os
 import signal
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from f1_downloader.cache import CircuitCache
 from f1_downloader.clients.osm import OsmClient
@@ -13,8 +16,9 @@ from f1_downloader.clients.overpass import OverpassClient
 from f1_downloader.clients.wikidata import WikidataClient
 from f1_downloader.clients.wikipedia import WikipediaClient
 from f1_downloader.config import Config
-from f1_downloader.services import process_circuit
-from f1_downloader.utils import setup_logging
+from f1_downloader.models import Circuit, ProcessResult
+from f1_downloader.services import prefetch_lookups, process_circuit
+from f1_downloader.utils import log_context, setup_logging
 
 
 def _handle_interrupt(_sig: int, _frame: object) -> None:
@@ -50,6 +54,7 @@ def run(check_update: bool = False) -> None:
 
     # Initialize clients
     cache = CircuitCache(config.mappings_file, logger)
+    atexit.register(cache.save)
     overpass = OverpassClient(config, logger)
     wikidata = WikidataClient(config, logger)
     osm = OsmClient(config, logger)
@@ -58,13 +63,13 @@ def run(check_update: bool = False) -> None:
     # Show cache stats
     manual, auto = cache.stats
 
-    logger.info(f"Cache: {manual} manual + {auto} auto-discovered mappings")
+    logger.info("Cache: %s manual + %s auto-discovered mappings", manual, auto)
 
     # Fetch circuits from Wikipedia
     try:
         circuits = wikipedia.fetch_circuits()
     except Exception as e:
-        logger.error(f"Failed to fetch circuits: {e}")
+        logger.error("Failed to fetch circuits: %s", e)
         sys.exit(1)
 
     if not circuits:
@@ -76,56 +81,89 @@ def run(check_update: bool = False) -> None:
     success = 0
     failed = 0
     skipped = 0
-    failed_list: list[tuple[str, str]] = []
+    failed_list: list[tuple[int, str, str]] = []
 
     logger.info(f"\n{'=' * 60}")
-    logger.info(f"Processing {total} circuits...")
+    logger.info("Processing %s circuits...", total)
 
     if check_update:
         logger.info("   (update check mode)")
 
     logger.info(f"{'=' * 60}\n")
 
-    for idx, circuit in enumerate(circuits, 1):
-        logger.info(f"[{idx}/{total}] {circuit.name}")
-
-        result = process_circuit(
-            circuit=circuit,
-            output_dir=config.output_dir,
-            cache=cache,
-            wikidata=wikidata,
-            overpass=overpass,
-            osm=osm,
-            logger=logger,
-            check_update=check_update,
-        )
-
-        if result.success:
-            if result.is_skipped:
-                skipped += 1
-            else:
-                success += 1
-            logger.info(f"    {result.message}")
-        else:
-            failed += 1
-            failed_list.append((circuit.name, result.message))
-            logger.warning(f"    {result.message}")
+    # Resolve Q-IDs and wikidata tags for all circuits at once
+    prefetched = prefetch_lookups(
+        circuits, config.output_dir, cache, wikidata, overpass, osm, logger, check_update
+    )
+
+    def worker(item: tuple[int, Circuit]) -> ProcessResult:
+        idx, circuit = item
+        logger.info("[%s/%s] %s", idx, total, circuit.name)
+
+        with log_context(circuit.name):
+            return process_circuit(
+                circuit=circuit,
+                output_dir=config.output_dir,
+                cache=cache,
+                wikidata=wikidata,
+                overpass=overpass,
+                osm=osm,
+                logger=logger,
+                check_update=check_update,
+                prefetched=prefetched,
+            )
+
+    # Circuits are I/O-bound: overlap their requests, clients rate limit per host
+    executor = ThreadPoolExecutor(max_workers=config.workers)
 
-        time.sleep(config.request_delay)
+    try:
+        futures = {
+            executor.submit(worker, (idx, circuit)): (idx, circuit)
+            for idx, circuit in enumerate(circuits, 1)
+        }
+
+        # Handle results as soon as they are ready, a slow circuit doesn't hold back the rest
+        for done, future in enumerate(as_completed(futures), 1):
+            idx, circuit = futures[future]
+            result = future.result()
+
+            if result.success:
+                if result.is_skipped:
+                    skipped += 1
+                else:
+                    success += 1
+                logger.info("    [%s/%s] %s", idx, total, result.message)
+            else:
+                failed += 1
+                failed_list.append((idx, circuit.name, result.message))
+                logger.warning("    [%s/%s] %s", idx, total, result.message)
+
+            if done % config.cache_flush_interval == 0:
+                cache.flush()
+    except SystemExit as e:
+        # Ctrl+C: don't wait for in-flight circuits (Overpass calls can take minutes).
+        # Worker threads are joined at interpreter exit, so leave with os._exit.
+        executor.shutdown(wait=False, cancel_futures=True)
+        cache.save()
+        logging.shutdown()
+        os._exit(e.code if isinstance(e.code, int) else 1)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        cache.save()
 
     # Summary
     logger.info(f"\n{'=' * 60}")
-    logger.info(f"Results: {success} saved | {skipped} skipped | {failed} failed")
+    logger.info("Results: %s saved | %s skipped | %s failed", success, skipped, failed)
     logger.info(f"{'=' * 60}")
 
     if failed_list:
         logger.info("\nFailed circuits:\n")
 
-        for name, reason in failed_list:
-            logger.info(f"   - {name}")
+        for _, name, reason in sorted(failed_list):
+            logger.info("   - %s", name)
 
             for line in reason.split("\n"):
-                logger.info(f"     {line}")
+                logger.info("     %s", line)
 
             logger.info("")
 
@@ -2,36 +2,129 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+from f1_downloader.cache import DiskCache
+from f1_downloader.ratelimit import AdaptiveLimiter
+from f1_downloader.utils import json_loads
+
+try:
+    from requests_cache import CachedSession
+except ImportError:  # Optional, falls back to uncached requests
+    CachedSession = None
 
 if TYPE_CHECKING:
     from f1_downloader.config import Config
 
 
+def _cacheable(response: requests.Response) -> bool:
+    """Keep non-JSON Overpass answers (HTML error pages sent with 200) out of the cache."""
+
+    if response.request.method != "POST":  # Only Overpass queries are POSTed
+        return True
+
+    return "json" in response.headers.get("Content-Type", "")
+
+
+def create_session(config: Config) -> requests.Session:
+    """
+    Create HTTP session with configured headers and a pooled adapter.
+
+    Connections are kept alive and reused across threads (up to 32 per
+    host), idempotent requests are retried on 5xx with backoff. 429 is
+    left to the clients' rate limiters, which adapt to it.
+    When requests-cache is installed, responses are cached on disk
+    (SQLite under config.cache_dir) so repeated runs skip identical
+    Wikipedia/Wikidata/OSM/Overpass lookups. Responses that ask for
+    revalidation (the Wikipedia circuit list) are revalidated with their
+    ETag / Last-Modified, unchanged pages cost a bodyless 304.
+    """
+
+    if CachedSession is None:
+        session = requests.Session()
+    else:
+        session = CachedSession(
+            cache_name=str(config.cache_dir / "http"),
+            backend="sqlite",
+            expire_after=timedelta(days=config.http_cache_days),
+            urls_expire_after={
+                # Versions must be fresh for --check-update: always revalidate
+                "www.openstreetmap.org/api/*": 0,
+            },
+            cache_control=True,
+            stale_if_error=True,
+            allowable_methods=("GET", "HEAD", "POST"),
+            allowable_codes=(200,),  # Never replay errors or rate limits
+            filter_fn=_cacheable,
+        )
+
+    # One pool per host, or idle keep-alive connections get evicted:
+    # Wikipedia, Wikidata API, Wikidata SPARQL, OSM API + Overpass mirrors
+    adapter = HTTPAdapter(
+        pool_connections=4 + len(config.overpass_servers),
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=config.max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update(config.headers)
+    # Brotli is only advertised when a decoder is installed
+    session.headers.update(make_headers(keep_alive=True, accept_encoding=True))
+
+    return session
+
+
 class HttpClient:
-    """Base HTTP client with configured headers and timeout."""
+    """Base HTTP client with configured headers, timeout, rate limit and JSON cache."""
 
     def __init__(self, config: Config, logger: logging.Logger) -> None:
         self.config = config
         self.logger = logger
-        self._session = requests.Session()
-        self._session.headers.update(config.headers)
+        self._session = config.session
+        self._json_cache = DiskCache(config.cache_dir / "json.sqlite")
+        # Per-host delay, adapted to 429 / Retry-After responses
+        self._limiter = AdaptiveLimiter(config.request_delay, config.max_request_delay)
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send request through the per-host limiter and feed the response back."""
+
+        host = urlsplit(url).netloc
+        self._limiter.wait(host)
+
+        resp = self._session.request(method, url, **kwargs)
+        self._limiter.observe(host, resp.status_code, resp.headers)
+
+        return resp
 
     def get(
         self,
         url: str,
         params: dict[str, Any] | None = None,
         timeout: int | None = None,
+        headers: dict[str, str] | None = None,
     ) -> requests.Response:
         """Make GET request."""
 
-        return self._session.get(
+        return self._request(
+            "GET",
             url,
             params=params,
             timeout=timeout or self.config.timeout,
+            headers=headers,
         )
 
     def post(
@@ -42,7 +135,8 @@ class HttpClient:
     ) -> requests.Response:
         """Make POST request."""
 
-        return self._session.post(
+        return self._request(
+            "POST",
             url,
             data=data,
             timeout=timeout or self.config.timeout,
@@ -51,7 +145,8 @@ class HttpClient:
     def head(self, url: str, timeout: int | None = None) -> requests.Response:
         """Make HEAD request."""
 
-        return self._session.head(
+        return self._request(
+            "HEAD",
             url,
             timeout=timeout or self.config.timeout,
         )
@@ -62,11 +157,36 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         timeout: int | None = None,
     ) -> dict[str, Any] | None:
-        """Make GET request and return JSON or None on error."""
+        """
+        Make GET request and return JSON or None on error.
+
+        Successful responses are cached on disk for config.json_cache_days,
+        keyed by URL and sorted query parameters. That cache is the only one:
+        the request skips the session's HTTP cache. Bodies with an "error"
+        key (MediaWiki APIs report errors with HTTP 200) count as errors.
+        """
+        signature = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        key = hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+        cached = self._json_cache.get(key)
+
+        if cached is not None:
+            return cached
+
         try:
-            resp = self.get(url, params=params, timeout=timeout)
+            # Parsed JSON is cached below, no-store keeps requests-cache out of it
+            resp = self.get(
+                url, params=params, timeout=timeout, headers={"Cache-Control": "no-store"}
+            )
             resp.raise_for_status()
-
-            return resp.json()
+            data = json_loads(resp.content)
         except (requests.RequestException, ValueError):
             return None
+
+        if "error" in data:
+            self.logger.debug("API error from %s: %s", urlsplit(url).netloc, data["error"])
+            return None
+
+        self._json_cache.set(key, data, expire=self.config.json_cache_days * 86400)
+
+        return data
@@ -7,50 +7,140 @@ from typing import TYPE_CHECKING, Any
 
 import requests
 
+from f1_downloader.cache import DiskCache
+from f1_downloader.clients.http import HttpClient
+from f1_downloader.utils import json_loads
+
 if TYPE_CHECKING:
     from f1_downloader.config import Config
 
 
-class OsmClient:
+class OsmClient(HttpClient):
     """Client for OpenStreetMap API (not Overpass)."""
 
     OSM_API_BASE = "https://www.openstreetmap.org/api/0.6"
 
-    def __init__(self, config: Config, logger: logging.Logger) -> None:
-        self.config = config
-        self.logger = logger
-        self._session = requests.Session()
-        self._session.headers.update(config.headers)
+    # Elements per multi-fetch request (keeps URLs short)
+    FETCH_BATCH_SIZE = 100
 
-    def verify_exists(self, osm_id: int, osm_type: str = "relation") -> bool:
-        """Check if OSM element exists."""
+    def __init__(self, config: Config, logger: logging.Logger) -> None:
+        super().__init__(config, logger)
+        # Validators + version per element, for conditional requests across runs
+        self._versions = DiskCache(config.cache_dir / "osm_versions.sqlite")
+
+    def fetch(self, osm_id: int, osm_type: str = "relation") -> tuple[bool, int | None]:
+        """
+        Check that OSM element exists and get its current version.
+
+        One conditional GET: the stored ETag / Last-Modified are sent as
+        If-None-Match / If-Modified-Since, so an unchanged element costs a
+        bodyless 304 and no JSON parsing.
+        Returns (exists, version). Assumes the element exists on network error.
+        """
+
+        key = f"{osm_type}:{osm_id}"
+        known: dict[str, Any] | None = self._versions.get(key)
+        headers: dict[str, str] = {}
+
+        if known:
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
 
         try:
-            resp = self._session.head(
-                f"{self.OSM_API_BASE}/{osm_type}/{osm_id}",
+            resp = self.get(
+                f"{self.OSM_API_BASE}/{osm_type}/{osm_id}.json",
                 timeout=10,
+                headers=headers,
             )
 
-            return resp.status_code == 200
-        except requests.RequestException:
-            return True  # Assume exists on network error
+            if resp.status_code == 304 and known:
+                return True, known.get("version")
 
-    def get_version(self, osm_id: int, osm_type: str = "relation") -> int | None:
-        """Get current OSM element version."""
-
-        try:
-            resp = self._session.get(
-                f"{self.OSM_API_BASE}/{osm_type}/{osm_id}.json",
-                timeout=10,
-            )
+            if resp.status_code in (404, 410):  # 410 = deleted
+                return False, None
 
             if resp.status_code == 200:
-                data: dict[str, Any] = resp.json()
+                data: dict[str, Any] = json_loads(resp.content)
                 elements = data.get("elements", [])
+                version = elements[0].get("version") if elements else None
+
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+
+                if version is not None and (etag or last_modified):
+                    self._versions.set(
+                        key,
+                        {"etag": etag, "last_modified": last_modified, "version": version},
+                    )
+
+                return True, version
 
-                if elements:
-                    return elements[0].get("version")
         except (requests.RequestException, KeyError, ValueError):
             pass
 
-        return None
+        return True, None
+
+    def fetch_batch(
+        self,
+        elements: list[tuple[int, str]],
+    ) -> dict[tuple[int, str], tuple[bool, int | None]]:
+        """
+        Check existence and current version of many elements at once.
+
+        Uses the multi-fetch API (one request per type and FETCH_BATCH_SIZE
+        IDs) instead of one fetch() per element.
+        Returns dict mapping (osm_id, osm_type) -> (exists, version). Elements
+        of failed requests are left out, so callers fall back to fetch().
+        """
+
+        ids_by_type: dict[str, list[int]] = {}
+
+        for osm_id, osm_type in dict.fromkeys(elements):
+            ids_by_type.setdefault(osm_type, []).append(osm_id)
+
+        results: dict[tuple[int, str], tuple[bool, int | None]] = {}
+
+        for osm_type, ids in ids_by_type.items():
+            for start in range(0, len(ids), self.FETCH_BATCH_SIZE):
+                chunk = ids[start : start + self.FETCH_BATCH_SIZE]
+                results.update(self._fetch_chunk(osm_type, chunk))
+
+        return results
+
+    def _fetch_chunk(
+        self,
+        osm_type: str,
+        ids: list[int],
+    ) -> dict[tuple[int, str], tuple[bool, int | None]]:
+        """Run one multi-fetch request, empty dict if it failed."""
+
+        try:
+            resp = self.get(
+                f"{self.OSM_API_BASE}/{osm_type}s.json",
+                params={f"{osm_type}s": ",".join(map(str, ids))},
+                timeout=30,
+            )
+
+            # 404 if any ID never existed: let fetch() sort those out one by one
+            if resp.status_code != 200:
+                return {}
+
+            data: dict[str, Any] = json_loads(resp.content)
+
+        except (requests.RequestException, ValueError):
+            return {}
+
+        results: dict[tuple[int, str], tuple[bool, int | None]] = {}
+
+        for el in data.get("elements", []):
+            if el.get("type") == osm_type and "id" in el:
+                results[(el["id"], osm_type)] = (el.get("visible", True), el.get("version"))
+
+        return results
+
+    def get_version(self, osm_id: int, osm_type: str = "relation") -> int | None:
+        """Get current OSM element version (convenience wrapper)."""
+
+        return self.fetch(osm_id, osm_type)[1]
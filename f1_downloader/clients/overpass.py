@@ -2,106 +2,279 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 import requests
 
+from f1_downloader.cache import DiskCache
+from f1_downloader.clients.http import CachedSession
+from f1_downloader.ratelimit import TokenBucket, parse_retry_after
+from f1_downloader.utils import json_loads
+
 if TYPE_CHECKING:
     from f1_downloader.config import Config
 
 
+# Escapes for literal text inside an Overpass regex string. Every regex
+# escape is doubled: the QL string literal unescapes once, the regex once.
+_OVERPASS_REGEX_ESCAPES = str.maketrans(
+    {
+        **{ch: "\\\\" + ch for ch in ".+*?()[]{}|^$"},  # POSIX ERE metacharacters
+        "\\": "\\\\\\\\",
+        '"': '\\"',  # Would end the QL string
+    }
+)
+
+
+def _escape_overpass_regex(text: str) -> str:
+    """Escape text for literal use in an Overpass regex string."""
+
+    return text.translate(_OVERPASS_REGEX_ESCAPES)
+
+
 class OverpassClient:
     """Client for Overpass API with multiple server failover and caching."""
 
+    # Query templates: identical parameters give byte-identical request bodies,
+    # so the HTTP cache can match them
+    WIKIDATA_QUERY = (
+        '[out:json][timeout:25];(relation["wikidata"="{qid}"];way["wikidata"="{qid}"];);out body;'
+    )
+    WIKIDATA_BATCH_QUERY = "[out:json][timeout:60];({filters});out body;"
+    WIKIDATA_BATCH_FILTER = 'relation["wikidata"="{qid}"];way["wikidata"="{qid}"];'
+    WIKIDATA_BATCH_SIZE = 25  # Q-IDs per batch query, keeps each under the server timeout
+    NAME_QUERY = """[out:json][timeout:{server_timeout}];
+(
+  relation["leisure"="track"]["name"~"{pattern}",i];
+  relation["sport"~"motor"]["name"~"{pattern}",i];
+  relation["highway"="raceway"]["name"~"{pattern}",i];
+  relation["type"="circuit"]["name"~"{pattern}",i];
+  way["leisure"="track"]["name"~"{pattern}",i];
+  way["sport"~"motor"]["name"~"{pattern}",i];
+  way["highway"="raceway"]["name"~"{pattern}",i];
+);
+out body;"""
+    COMPLEX_QUERY = """[out:json][timeout:60];
+{parent_type}({parent_id});
+>>;
+(
+  nwr._["type"="circuit"];
+  nwr._["highway"="raceway"];
+);
+out body;"""
+    # One block per parent; "out count" closes each group so results map back in order
+    COMPLEX_BATCH_QUERY = "[out:json][timeout:90];{blocks}"
+    COMPLEX_BATCH_BLOCK = (
+        '{parent_type}({parent_id});>>;'
+        '(nwr._["type"="circuit"];nwr._["highway"="raceway"];);'
+        "out body;out count;"
+    )
+    GEOMETRY_QUERY = "[out:json][timeout:60];{osm_type}({osm_id});out geom;"
+
+    # Circuit score contribution per tag value (see _circuit_score)
+    TAG_SCORES: dict[str, dict[str, int]] = {
+        "type": {
+            "circuit": 100,  # Strong circuit indicator
+            "multipolygon": -30,  # Likely a complex, not the track
+            "site": -30,
+        },
+        "highway": {
+            "raceway": 50,
+            "services": -60,  # Service station, definitely not a circuit
+        },
+        "leisure": {
+            "track": 10,
+            "sports_centre": -50,
+        },
+    }
+
     def __init__(self, config: Config, logger: logging.Logger) -> None:
         self.config = config
         self.logger = logger
-        self._session = requests.Session()
-        self._session.headers.update(config.headers)
+        self._session = config.session
         self._current_server: str | None = None
-        self._last_request_time: float = 0
+        # Per-server quotas (the only Overpass pacing), so idle servers can absorb bursts
+        self._buckets = {
+            name: TokenBucket(config.overpass_rate, config.overpass_burst)
+            for name, _ in config.overpass_servers
+        }
         # In-memory cache for geometry to avoid duplicate requests
         self._geometry_cache: dict[tuple[int, str], dict[str, Any]] = {}
+        # Persistent geometry cache, keyed by OSM version (new version = miss)
+        self._geometry_store = DiskCache(config.cache_dir / "geometry.sqlite")
+
+    def _from_cache(self, query: str) -> tuple[dict[str, Any] | None, str | None]:
+        """
+        Look the query up in the on-disk HTTP cache only (no network).
+
+        Responses are cached per server URL, so every server is probed.
+        requests-cache answers a miss with 504, unparsable entries count as misses.
+        """
+        for server_name, server_url in self.config.overpass_servers:
+            try:
+                resp = self._session.post(
+                    server_url,
+                    data={"data": query},
+                    only_if_cached=True,
+                )
+            except requests.RequestException:
+                continue
+
+            if resp.status_code != 200:
+                continue
+
+            try:
+                return json_loads(resp.content), server_name
+            except ValueError:  # Stored before non-JSON bodies were filtered out
+                self.logger.debug("       Skipping unreadable cached response from %s", server_name)
 
-    def _rate_limit(self) -> None:
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.config.request_delay:
-            time.sleep(self.config.request_delay - elapsed)
-        self._last_request_time = time.time()
+        return None, None
+
+    def _wait_for_quota(self) -> tuple[str, str]:
+        """Block until some server has quota, take a token and return (name, url)."""
+
+        while True:
+            time.sleep(min(bucket.delay() for bucket in self._buckets.values()))
+
+            # Servers in preference order; another thread may have taken the token
+            for server_name, server_url in self.config.overpass_servers:
+                if self._buckets[server_name].consume():
+                    return server_name, server_url
 
     def query(
         self,
         query: str,
         timeout: int | None = None,
+        refresh: bool = False,
     ) -> tuple[dict[str, Any] | None, str | None]:
         """
         Execute Overpass query with automatic failover.
 
         Returns (data, server_name) tuple. Both are None if all servers fail.
+        Cached responses are returned before any quota is used or rate
+        limit waited for. With refresh=True the on-disk HTTP cache is bypassed.
 
         Smart retry logic:
         - If ALL servers timeout → query is too heavy, skip retry
         - Retry only for rate limits (429) or mixed errors
         """
-        self._rate_limit()
+        # Short stable ID to correlate log lines of the same query across runs
+        query_id = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+        self.logger.debug("       Overpass query %s", query_id)
 
         timeout = timeout or self.config.timeout
         last_error: Exception | None = None
         total_servers = len(self.config.overpass_servers)
+        extra: dict[str, Any] = {}
+
+        if CachedSession is not None:
+            if refresh:
+                extra["force_refresh"] = True
+            else:
+                data, server_name = self._from_cache(query)
+
+                if data is not None:
+                    self.logger.debug("       Overpass cache hit %s", query_id)
+                    return data, server_name
 
         for attempt in range(self.config.max_retries):
             if attempt > 0:
-                self.logger.info(f"       Retry {attempt + 1}/{self.config.max_retries}...")
+                self.logger.info("       Retry %s/%s...", attempt + 1, self.config.max_retries)
 
             # Track error types in this round
             timeouts = 0
             rate_limits = 0
             other_errors = 0
+            quota_skips = 0  # Not contacted, says nothing about the query
+
+            sent = 0
 
             for idx, (server_name, server_url) in enumerate(self.config.overpass_servers, 1):
+                bucket = self._buckets[server_name]
+
+                if not bucket.consume():
+                    if idx < total_servers or sent:
+                        quota_skips += 1
+                        self.logger.debug(
+                            "       [%s/%s] %s: over quota, trying next...",
+                            idx,
+                            total_servers,
+                            server_name,
+                        )
+                        continue
+
+                    # Nothing sent this round: wait for the first server with quota
+                    self.logger.debug("       All servers over quota, waiting...")
+                    server_name, server_url = self._wait_for_quota()
+                    bucket = self._buckets[server_name]
+
+                sent += 1
+
                 try:
                     resp = self._session.post(
                         server_url,
                         data={"data": query},
                         timeout=timeout,
+                        **extra,
                     )
 
                     if resp.status_code == 200:
+                        data = json_loads(resp.content)  # Mirrors under load may send HTML
+                        bucket.reward()
+
                         if self._current_server is None:
-                            self.logger.info(f"       Using Overpass server: {server_name}")
+                            self.logger.info("       Using Overpass server: %s", server_name)
                         elif self._current_server != server_name:
                             self.logger.info(
-                                f"       Server switched: {self._current_server} -> {server_name}"
+                                "       Server switched: %s -> %s",
+                                self._current_server,
+                                server_name,
                             )
                         self._current_server = server_name
 
-                        return resp.json(), server_name
+                        return data, server_name
 
                     # Server returned error
                     if resp.status_code == 429:
+                        bucket.penalize(parse_retry_after(resp.headers.get("Retry-After")))
                         rate_limits += 1
                         self.logger.info(
-                            f"       [{idx}/{total_servers}] {server_name}: rate limited (429), trying next..."
+                            "       [%s/%s] %s: rate limited (429), trying next...",
+                            idx,
+                            total_servers,
+                            server_name,
                         )
                     elif resp.status_code == 504:
                         timeouts += 1  # Gateway timeout = server-side timeout
                         self.logger.info(
-                            f"       [{idx}/{total_servers}] {server_name}: gateway timeout (504), trying next..."
+                            "       [%s/%s] %s: gateway timeout (504), trying next...",
+                            idx,
+                            total_servers,
+                            server_name,
                         )
                     else:
                         other_errors += 1
                         self.logger.info(
-                            f"       [{idx}/{total_servers}] {server_name}: error {resp.status_code}, trying next..."
+                            "       [%s/%s] %s: error %s, trying next...",
+                            idx,
+                            total_servers,
+                            server_name,
+                            resp.status_code,
                         )
                     continue
 
                 except requests.exceptions.Timeout:
                     timeouts += 1
                     self.logger.info(
-                        f"       [{idx}/{total_servers}] {server_name}: timeout ({timeout}s), trying next..."
+                        "       [%s/%s] %s: timeout (%ss), trying next...",
+                        idx,
+                        total_servers,
+                        server_name,
+                        timeout,
                     )
                     continue
 
@@ -109,16 +282,35 @@ class OverpassClient:
                     last_error = e
                     other_errors += 1
                     self.logger.info(
-                        f"       [{idx}/{total_servers}] {server_name}: connection error, trying next..."
+                        "       [%s/%s] %s: connection error, trying next...",
+                        idx,
+                        total_servers,
+                        server_name,
+                    )
+                    continue
+
+                except ValueError as e:
+                    last_error = e
+                    other_errors += 1
+                    self.logger.info(
+                        "       [%s/%s] %s: invalid JSON response, trying next...",
+                        idx,
+                        total_servers,
+                        server_name,
                     )
                     continue
 
             # All servers failed this round - decide whether to retry
             if rate_limits == 0:
-                # No rate limits - all servers either timed out or had connection errors
+                # No rate limits - contacted servers either timed out or had connection errors
                 # Retry won't help, the query is too heavy or servers are down
                 self.logger.warning(
-                    f"       All {total_servers} servers failed ({timeouts} timeouts, {other_errors} errors) - skipping retry"
+                    "       All %s servers failed (%s timeouts, %s errors, %s over quota)"
+                    " - skipping retry",
+                    total_servers,
+                    timeouts,
+                    other_errors,
+                    quota_skips,
                 )
                 return None, None
 
@@ -126,16 +318,18 @@ class OverpassClient:
             if attempt < self.config.max_retries - 1:
                 wait = self.config.retry_delay * (attempt + 2)  # Extra wait for rate limits
                 self.logger.info(
-                    f"       {rate_limits} server(s) rate limited, waiting {wait}s before retry..."
+                    "       %s server(s) rate limited, waiting %ss before retry...",
+                    rate_limits,
+                    wait,
                 )
                 time.sleep(wait)
 
         # All retries exhausted
         self.logger.warning(
-            f"       All servers failed after {self.config.max_retries} attempts"
+            "       All servers failed after %s attempts", self.config.max_retries
         )
         if last_error:
-            self.logger.debug(f"       Last error: {last_error}")
+            self.logger.debug("       Last error (%s): %s", query_id, last_error)
 
         return None, None
 
@@ -145,37 +339,59 @@ class OverpassClient:
         Higher score = more likely to be the circuit we want.
         """
 
-        tags = element.get("tags", {})
-        score = 0
+        return self._score_tags(
+            frozenset(element.get("tags", {}).items()), element.get("type", "")
+        )
 
-        # Strong circuit indicators (high priority)
-        if tags.get("type") == "circuit":
-            score += 100
-        if tags.get("highway") == "raceway":
-            score += 50
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score_tags(tags_sig: frozenset[tuple[str, str]], el_type: str) -> int:
+        """Score a tag set (memoized: many elements share identical tags)."""
 
-        # Medium indicators
+        tags = dict(tags_sig)
+        score = sum(
+            values.get(tags.get(key), 0)
+            for key, values in OverpassClient.TAG_SCORES.items()
+        )
+
+        # Medium indicator
         if "motor" in tags.get("sport", ""):
             score += 10
-        if tags.get("leisure") == "track":
-            score += 10
 
-        # Negative indicators (likely a complex, not the track)
-        if tags.get("type") in ("multipolygon", "site"):
-            score -= 30
-        if tags.get("leisure") == "sports_centre":
-            score -= 50
-        if tags.get("highway") == "services":
-            score -= 60  # Service station, definitely not a circuit
+        # Likely a complex, not the track
         if "landuse" in tags or "amenity" in tags:
             score -= 20
 
         # Prefer relations over ways (small bonus)
-        if element.get("type") == "relation":
+        if el_type == "relation":
             score += 5
 
         return score
 
+    def _pick_best(
+        self,
+        elements: list[dict[str, Any]],
+    ) -> tuple[int, dict[str, Any], int]:
+        """
+        Pick the highest-scoring element in a single pass (first one wins ties).
+
+        Returns (best_score, best_element, high_score_count) where
+        high_score_count is the number of elements scoring above 50.
+        """
+
+        best_score, best = self._circuit_score(elements[0]), elements[0]
+        high_score_count = int(best_score > 50)
+
+        for el in elements[1:]:
+            score = self._circuit_score(el)
+
+            if score > 50:
+                high_score_count += 1
+            if score > best_score:
+                best_score, best = score, el
+
+        return best_score, best, high_score_count
+
     def _find_circuit_in_complex(
         self,
         parent_id: int,
@@ -186,28 +402,59 @@ class OverpassClient:
         Uses >> operator for recursive descent.
         """
 
-        query = f"""[out:json][timeout:60];
-{parent_type}({parent_id});
->>;
-(
-  nwr._["type"="circuit"];
-  nwr._["highway"="raceway"];
-);
-out body;"""
+        query = self.COMPLEX_QUERY.format(parent_type=parent_type, parent_id=parent_id)
 
         data, server = self.query(query, timeout=90)
 
         if data and data.get("elements"):
             # Use same scoring logic
-            scored = [(self._circuit_score(el), el) for el in data["elements"]]
-            scored.sort(key=lambda x: x[0], reverse=True)
+            best_score, best, _ = self._pick_best(data["elements"])
 
-            if scored and scored[0][0] > 0:  # Only return if positive score
-                best = scored[0][1]
+            if best_score > 0:  # Only return if positive score
                 return best["id"], best["type"], server
 
         return None, None, None
 
+    def _find_circuits_in_complexes(
+        self,
+        parents: list[tuple[int, str]],
+    ) -> dict[tuple[int, str], tuple[int, str, int]]:
+        """
+        Recursive descent into several complexes with a single query.
+
+        Returns dict mapping (parent_id, parent_type) -> (osm_id, osm_type, score)
+        for parents containing a positively scored circuit.
+        """
+        if not parents:
+            return {}
+
+        blocks = "".join(
+            self.COMPLEX_BATCH_BLOCK.format(parent_type=parent_type, parent_id=parent_id)
+            for parent_id, parent_type in parents
+        )
+        data, _ = self.query(self.COMPLEX_BATCH_QUERY.format(blocks=blocks), timeout=90)
+
+        found: dict[tuple[int, str], tuple[int, str, int]] = {}
+        if not data:
+            return found
+
+        # Elements arrive in block order, each group terminated by a count element
+        pending = iter(parents)
+        group: list[dict[str, Any]] = []
+        for el in data.get("elements", []):
+            if el.get("type") != "count":
+                group.append(el)
+                continue
+
+            parent = next(pending, None)
+            if parent is not None and group:
+                best_score, best, _ = self._pick_best(group)
+                if best_score > 0:
+                    found[parent] = (best["id"], best["type"], best_score)
+            group = []
+
+        return found
+
     def find_by_wikidata_tag(
         self,
         qid: str,
@@ -218,7 +465,7 @@ out body;"""
         Returns (osm_id, osm_type, server_name).
         """
 
-        query = f'[out:json][timeout:25];(relation["wikidata"="{qid}"];way["wikidata"="{qid}"];);out body;'
+        query = self.WIKIDATA_QUERY.format(qid=qid)
         data, server = self.query(query)
 
         if data:
@@ -227,17 +474,14 @@ out body;"""
                 return None, None, None
 
             # Score all elements and pick the best one
-            scored = [(self._circuit_score(el), el) for el in elements]
-            scored.sort(key=lambda x: x[0], reverse=True)
-
-            best_score, best = scored[0]
+            best_score, best, high_score_count = self._pick_best(elements)
             best_tags = best.get("tags", {})
 
             # Warn if multiple high-scoring candidates (ambiguous result)
-            high_score_count = sum(1 for s, _ in scored if s > 50)
             if high_score_count > 1:
                 self.logger.warning(
-                    f"       Multiple high-scoring elements found ({high_score_count}), using first"
+                    "       Multiple high-scoring elements found (%s), using first",
+                    high_score_count,
                 )
 
             # Check if best is still a complex (needs recursive descent)
@@ -269,35 +513,31 @@ out body;"""
         Returns (osm_id, osm_type, server_name).
         """
 
-        query = f"""[out:json][timeout:30];
-(
-  relation["leisure"="track"]["name"~"{search_name}",i];
-  relation["sport"~"motor"]["name"~"{search_name}",i];
-  relation["highway"="raceway"]["name"~"{search_name}",i];
-  relation["type"="circuit"]["name"~"{search_name}",i];
-  way["leisure"="track"]["name"~"{search_name}",i];
-  way["sport"~"motor"]["name"~"{search_name}",i];
-  way["highway"="raceway"]["name"~"{search_name}",i];
-);
-out body;"""
+        escaped = _escape_overpass_regex(search_name)
 
-        data, server = self.query(query)
+        # Exact (anchored) match first: cheap for the server's regex engine
+        data, server = self.query(
+            self.NAME_QUERY.format(pattern=f"^{escaped}$", server_timeout=10)
+        )
+
+        if not (data and data.get("elements")):
+            self.logger.info("       -> no exact name match, trying partial match...")
+            data, server = self.query(
+                self.NAME_QUERY.format(pattern=escaped, server_timeout=30)
+            )
 
         if data and data.get("elements"):
             elements = data["elements"]
 
             # Score all elements and pick the best one
-            scored = [(self._circuit_score(el), el) for el in elements]
-            scored.sort(key=lambda x: x[0], reverse=True)
-
-            best_score, best = scored[0]
+            best_score, best, high_score_count = self._pick_best(elements)
             best_tags = best.get("tags", {})
 
             # Warn if multiple high-scoring candidates
-            high_score_count = sum(1 for s, _ in scored if s > 50)
             if high_score_count > 1:
                 self.logger.warning(
-                    f"       Multiple high-scoring elements found ({high_score_count}), using first"
+                    "       Multiple high-scoring elements found (%s), using first",
+                    high_score_count,
                 )
 
             # Check if best is still a complex (needs recursive descent)
@@ -324,27 +564,50 @@ out body;"""
         osm_id: int,
         osm_type: str = "relation",
         use_cache: bool = True,
+        version: int | None = None,
     ) -> tuple[dict[str, Any] | None, str | None]:
         """
         Get geometry for OSM element.
 
         Returns (element_data, server_name).
-        Uses in-memory cache to avoid duplicate requests.
+        Uses in-memory cache to avoid duplicate requests. When the element
+        version is known, geometry is also persisted across runs.
+        use_cache=False bypasses all caches (results are still stored).
         """
         cache_key = (osm_id, osm_type)
+        store_key = f"{osm_type}:{osm_id}:{version}" if version is not None else None
 
         # Check cache first
         if use_cache and cache_key in self._geometry_cache:
-            self.logger.debug(f"    Geometry cache hit: {osm_type} {osm_id}")
+            self.logger.debug("    Geometry cache hit: %s %s", osm_type, osm_id)
             return self._geometry_cache[cache_key], "cache"
 
-        query = f"[out:json][timeout:60];{osm_type}({osm_id});out geom;"
-        data, server = self.query(query, timeout=90)
+        if use_cache and store_key:
+            element = self._geometry_store.get(store_key)
+
+            if element is not None:
+                self.logger.debug(
+                    "    Geometry disk cache hit: %s %s v%s",
+                    osm_type,
+                    osm_id,
+                    version,
+                )
+                self._geometry_cache[cache_key] = element
+                return element, "disk cache"
+
+        query = self.GEOMETRY_QUERY.format(osm_type=osm_type, osm_id=osm_id)
+        data, server = self.query(query, timeout=90, refresh=not use_cache)
 
         if data and data.get("elements"):
             element = data["elements"][0]
             # Store in cache
             self._geometry_cache[cache_key] = element
+
+            if store_key:
+                self._geometry_store.set(
+                    store_key, element, expire=self.config.geometry_cache_days * 86400
+                )
+
             return element, server
 
         return None, server
@@ -354,47 +617,50 @@ out body;"""
         qids: list[str],
     ) -> dict[str, tuple[int | None, str | None, int]]:
         """
-        Find OSM elements for multiple Q-IDs in one query.
+        Find OSM elements for multiple Q-IDs, WIKIDATA_BATCH_SIZE per query.
 
-        Returns dict mapping Q-ID -> (osm_id, osm_type, score).
+        Returns dict mapping Q-ID -> (osm_id, osm_type, score), with
+        (None, None, 0) for Q-IDs no element is tagged with. Q-IDs whose
+        query failed are left out, so callers can tell them from misses.
         Much more efficient than calling find_by_wikidata_tag() for each Q-ID.
         Score is computed from tags, no extra geometry request needed.
         """
-        if not qids:
-            return {}
+        qids = list(dict.fromkeys(qids))
+        results: dict[str, tuple[int | None, str | None, int]] = {}
+        elements: list[dict[str, Any]] = []
 
-        # Build query for all Q-IDs at once
-        qid_filters = "".join(f'relation["wikidata"="{qid}"];way["wikidata"="{qid}"];' for qid in qids)
-        query = f"[out:json][timeout:60];({qid_filters});out body;"
+        for start in range(0, len(qids), self.WIKIDATA_BATCH_SIZE):
+            chunk = qids[start : start + self.WIKIDATA_BATCH_SIZE]
+            qid_filters = "".join(self.WIKIDATA_BATCH_FILTER.format(qid=qid) for qid in chunk)
+            data, _ = self.query(self.WIKIDATA_BATCH_QUERY.format(filters=qid_filters), timeout=90)
 
-        data, _ = self.query(query, timeout=90)
-        results: dict[str, tuple[int | None, str | None, int]] = {qid: (None, None, 0) for qid in qids}
+            if data is None:
+                self.logger.debug("Wikidata tag search failed for %s Q-IDs", len(chunk))
+                continue
 
-        if not data:
-            return results
+            results.update((qid, (None, None, 0)) for qid in chunk)
+            elements.extend(data.get("elements", []))
 
-        elements = data.get("elements", [])
         if not elements:
             return results
 
         # Group elements by their wikidata tag
-        elements_by_qid: dict[str, list[dict[str, Any]]] = {qid: [] for qid in qids}
+        elements_by_qid: dict[str, list[dict[str, Any]]] = {qid: [] for qid in results}
         for el in elements:
             wikidata_tag = el.get("tags", {}).get("wikidata")
             if wikidata_tag and wikidata_tag in elements_by_qid:
                 elements_by_qid[wikidata_tag].append(el)
 
         # For each Q-ID, pick the best element
+        complexes: dict[str, tuple[int, str]] = {}
         for qid, qid_elements in elements_by_qid.items():
             if not qid_elements:
                 continue
 
             # Score and pick best
-            scored = [(self._circuit_score(el), el) for el in qid_elements]
-            scored.sort(key=lambda x: x[0], reverse=True)
-
-            best_score, best = scored[0]
+            best_score, best, _ = self._pick_best(qid_elements)
             best_tags = best.get("tags", {})
+            results[qid] = (best["id"], best["type"], best_score)
 
             # Check if it's a complex that needs recursive descent
             is_complex = (
@@ -404,22 +670,20 @@ out body;"""
             )
 
             if is_complex:
-                self.logger.info(f"       -> {qid}: found complex, searching inside...")
-                inner_id, inner_type, _ = self._find_circuit_in_complex(
-                    best["id"], best["type"]
-                )
-                if inner_id and inner_type:
-                    # Get score for inner element (from cache if available)
-                    inner_el, _ = self.get_geometry(inner_id, inner_type)
-                    inner_score = self._circuit_score(inner_el) if inner_el else 0
-                    self.logger.info(f"       -> {qid}: found {inner_type} {inner_id}")
-                    results[qid] = (inner_id, inner_type, inner_score)
-                    continue
+                self.logger.info("       -> %s: found complex, searching inside...", qid)
+                complexes[qid] = (best["id"], best["type"])
 
-            results[qid] = (best["id"], best["type"], best_score)
+        # Descend into all complexes at once, scoring inner elements from their tags
+        inner = self._find_circuits_in_complexes(list(dict.fromkeys(complexes.values())))
+        for qid, parent in complexes.items():
+            if parent in inner:
+                inner_id, inner_type, inner_score = inner[parent]
+                self.logger.info("       -> %s: found %s %s", qid, inner_type, inner_id)
+                results[qid] = (inner_id, inner_type, inner_score)
 
         return results
 
     def clear_cache(self) -> None:
-        """Clear the in-memory geometry cache."""
+        """Clear the in-memory geometry and score caches."""
         self._geometry_cache.clear()
+        self._score_tags.cache_clear()
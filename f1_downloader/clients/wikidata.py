@@ -3,88 +3,249 @@
 from __future__ import annotations
 
 import logging
-import time
+import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
-import requests
+from f1_downloader.clients.http import HttpClient
 
 if TYPE_CHECKING:
     from f1_downloader.config import Config
 
 
-class WikidataClient:
-    """Client for Wikidata API with rate limiting."""
+def _sparql_string(text: str) -> str:
+    """Quote text as a SPARQL string literal."""
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class WikidataClient(HttpClient):
+    """Client for Wikidata API with rate limiting and result caching."""
 
     # Keywords that indicate a circuit in Wikidata descriptions
     CIRCUIT_KEYWORDS = ("circuit", "track", "raceway", "motorsport", "racing")
+    _CIRCUIT_RE = re.compile("|".join(map(re.escape, CIRCUIT_KEYWORDS)))
+    _F1_RE = re.compile("formula|f1")
 
     # SPARQL endpoint for batch queries
     SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
 
+    # Names per EntitySearch SPARQL query (one mwapi call per name server-side)
+    SEARCH_BATCH_SIZE = 25
+
+    # P31 (instance of) classes that mark an item as a race track
+    CIRCUIT_CLASSES = frozenset({"Q1777138", "Q2338524"})  # race track, motorsport racing track
+
     def __init__(self, config: Config, logger: logging.Logger) -> None:
-        self.config = config
-        self.logger = logger
-        self._session = requests.Session()
-        self._session.headers.update(config.headers)
-        self._last_request_time: float = 0
-
-    def _rate_limit(self) -> None:
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.config.request_delay:
-            time.sleep(self.config.request_delay - elapsed)
-        self._last_request_time = time.time()
+        super().__init__(config, logger)
+        # Per-process memo of successful lookups (names repeat across circuits)
+        self._search_cache: dict[tuple[str, int], list[str]] = {}
+        self._p402: dict[str, int | None] = {}  # Q-ID -> OSM relation ID
 
     def find_ids(self, name: str, limit: int = 5) -> list[str]:
         """
         Find Wikidata Q-IDs for a circuit name.
 
         Returns list of Q-IDs sorted by relevance (circuit-related first).
+        wbsearchentities returns no P31 claims, so unlike find_ids_batch()
+        this ranks on descriptions only; a track with a vague description
+        may land below where the batch search would put it.
         """
-        self._rate_limit()
+        key = (name, limit)
+
+        if key in self._search_cache:
+            return self._search_cache[key]
+
+        data = self.get_json(
+            self.config.wikidata_api,
+            params={
+                "action": "wbsearchentities",
+                "search": name,
+                "language": "en",
+                "format": "json",
+                "limit": limit,
+            },
+            timeout=15,
+        )
+
+        if data is None:
+            return []
+
         try:
-            resp = self._session.get(
-                self.config.wikidata_api,
-                params={
-                    "action": "wbsearchentities",
-                    "search": name,
-                    "language": "en",
-                    "format": "json",
-                    "limit": limit,
-                },
-                timeout=15,
+            results = data.get("search", [])
+            qids = self._rank(
+                [(r["id"], r.get("description", ""), frozenset()) for r in results]
             )
 
-            data = resp.json()
-            results = data.get("search", [])
+        except (KeyError, ValueError):
+            return []
 
-            if not results:
-                return []
+        self._search_cache[key] = qids
 
-            # Score results: circuit-related get priority
-            scored: list[tuple[int, str]] = []
+        return qids
 
-            for r in results:
-                desc = r.get("description", "").lower()
-                score = 0
+    def _rank(self, results: list[tuple[str, str, frozenset[str]]]) -> list[str]:
+        """
+        Order (Q-ID, description, P31 classes) search results by relevance.
 
-                # Prioritize circuit-related results
-                if any(kw in desc for kw in self.CIRCUIT_KEYWORDS):
-                    score += 10
+        Circuit-related descriptions and race track classes come first,
+        ties keep search order. Classes are only known on the SPARQL path,
+        find_ids() passes an empty set and ranks on descriptions alone.
+        """
 
-                # Bonus for F1-specific
-                if "formula" in desc or "f1" in desc:
-                    score += 5
+        # Score results: circuit-related get priority
+        scored: list[tuple[int, str]] = []
 
-                scored.append((score, r["id"]))
+        for qid, description, classes in results:
+            desc = description.lower()
+            score = 0
 
-            # Sort by score (descending), return Q-IDs
-            scored.sort(key=lambda x: x[0], reverse=True)
+            # Prioritize circuit-related results
+            if self._CIRCUIT_RE.search(desc):
+                score += 10
 
-            return [qid for _, qid in scored]
+            # Instance of race track (empty for find_ids, see docstring)
+            if classes & self.CIRCUIT_CLASSES:
+                score += 10
 
-        except (requests.RequestException, KeyError, ValueError):
-            return []
+            # Bonus for F1-specific
+            if self._F1_RE.search(desc):
+                score += 5
+
+            scored.append((score, qid))
+
+        # Sort by score (descending, stable), return Q-IDs
+        scored.sort(key=itemgetter(0), reverse=True)
+
+        return [qid for _, qid in scored]
+
+    def find_ids_batch(self, names: list[str], limit: int = 5) -> dict[str, list[str]]:
+        """
+        Find Wikidata Q-IDs for several names with SPARQL entity search.
+
+        Names are searched SEARCH_BATCH_SIZE at a time, each batch in one
+        request through the mwapi EntitySearch service. The same query
+        returns P402 of every hit, so get_p402_batch() doesn't have to ask
+        for them again. Batches that fail fall back to find_ids() per name.
+        Returns dict mapping name -> Q-IDs sorted like find_ids().
+        """
+        results: dict[str, list[str]] = {}
+        missing: list[str] = []
+
+        for name in dict.fromkeys(names):
+            if (name, limit) in self._search_cache:
+                results[name] = self._search_cache[(name, limit)]
+            else:
+                missing.append(name)
+
+        for start in range(0, len(missing), self.SEARCH_BATCH_SIZE):
+            batch = missing[start : start + self.SEARCH_BATCH_SIZE]
+            found = self._search_batch(batch, limit)
+
+            if found is None:
+                self.logger.debug("SPARQL entity search failed, searching names one by one")
+                found = self.find_ids_many(batch, limit)
+            else:
+                self._search_cache.update(((name, limit), qids) for name, qids in found.items())
+
+            results.update(found)
+
+        return results
+
+    def _search_batch(self, names: list[str], limit: int) -> dict[str, list[str]] | None:
+        """Run one EntitySearch SPARQL query, None if the request failed."""
+
+        if not names:
+            return {}
+
+        values = " ".join(_sparql_string(name) for name in names)
+        query = f"""
+SELECT ?search ?item ?num ?desc ?type ?osmRelation WHERE {{
+  VALUES ?search {{ {values} }}
+  SERVICE wikibase:mwapi {{
+    bd:serviceParam wikibase:endpoint "www.wikidata.org";
+                    wikibase:api "EntitySearch";
+                    mwapi:search ?search;
+                    mwapi:language "en";
+                    wikibase:limit {limit}.
+    ?item wikibase:apiOutputItem mwapi:item.
+    ?num wikibase:apiOrdinal true.
+  }}
+  FILTER(?num < {limit})
+  OPTIONAL {{ ?item schema:description ?desc. FILTER(lang(?desc) = "en") }}
+  OPTIONAL {{ ?item wdt:P31 ?type. }}
+  OPTIONAL {{ ?item wdt:P402 ?osmRelation. }}
+}}
+"""
+
+        data = self.get_json(
+            self.SPARQL_ENDPOINT,
+            params={"query": query, "format": "json"},
+            timeout=30,
+        )
+
+        if data is None:
+            return None
+
+        try:
+            # name -> {Q-ID: (ordinal, description, P31 classes)}, one row per P31 value
+            hits: dict[str, dict[str, tuple[int, str, set[str]]]] = {name: {} for name in names}
+
+            for binding in data.get("results", {}).get("bindings", []):
+                name = binding["search"]["value"]
+                qid = binding["item"]["value"].split("/")[-1]
+
+                if name not in hits:
+                    continue
+
+                if qid not in hits[name]:
+                    ordinal = int(binding["num"]["value"])
+                    desc = binding.get("desc", {}).get("value", "")
+                    hits[name][qid] = (ordinal, desc, set())
+
+                if "type" in binding:
+                    hits[name][qid][2].add(binding["type"]["value"].split("/")[-1])
+
+                # P402 of every hit is known now, even when it is not set
+                osm_relation = binding.get("osmRelation", {}).get("value", "")
+
+                if osm_relation.isdigit():
+                    self._p402[qid] = int(osm_relation)
+                else:
+                    self._p402.setdefault(qid, None)
+
+            ranked: dict[str, list[str]] = {}
+
+            for name, found in hits.items():
+                in_search_order = sorted(found.items(), key=lambda x: x[1][0])
+                ranked[name] = self._rank(
+                    [(qid, desc, frozenset(classes)) for qid, (_, desc, classes) in in_search_order]
+                )
+
+            return ranked
+
+        except (KeyError, ValueError) as e:
+            self.logger.debug("SPARQL entity search failed: %s", e)
+            return None
+
+    def find_ids_many(self, names: list[str], limit: int = 5) -> dict[str, list[str]]:
+        """
+        Find Wikidata Q-IDs for several names concurrently.
+
+        Returns dict mapping name -> Q-IDs (same order as find_ids).
+        Requests overlap their round trips; the per-host limiter still
+        spaces them out.
+        """
+        names = list(dict.fromkeys(names))
+
+        if len(names) <= 1:
+            return {name: self.find_ids(name, limit) for name in names}
+
+        with ThreadPoolExecutor(max_workers=min(len(names), self.config.workers)) as pool:
+            results = pool.map(lambda name: self.find_ids(name, limit), names)
+
+            return dict(zip(names, results))
 
     def find_id(self, name: str) -> str | None:
         """
@@ -102,20 +263,18 @@ class WikidataClient:
         P402 is the "OpenStreetMap relation ID" property in Wikidata.
         Returns OSM relation ID or None if not set.
         """
-        self._rate_limit()
-        try:
-            resp = self._session.get(
-                f"{self.config.wikidata_entity}/{qid}.json",
-                timeout=15,
-            )
+        data = self.get_json(f"{self.config.wikidata_entity}/{qid}.json", timeout=15)
 
-            data = resp.json()
+        if data is None:
+            return None
+
+        try:
             claims = data["entities"][qid].get("claims", {})
 
             if "P402" in claims:
                 return int(claims["P402"][0]["mainsnak"]["datavalue"]["value"])
 
-        except (requests.RequestException, KeyError, ValueError):
+        except (KeyError, ValueError):
             pass
 
         return None
@@ -126,14 +285,17 @@ class WikidataClient:
 
         Returns dict mapping Q-ID -> OSM relation ID (or None if not set).
         Much more efficient than calling get_p402() for each Q-ID.
+        Q-IDs already known (from find_ids_batch() or earlier calls) are
+        answered without a request.
         """
-        if not qids:
-            return {}
+        known = {qid: self._p402[qid] for qid in qids if qid in self._p402}
+        missing = [qid for qid in qids if qid not in known]
 
-        self._rate_limit()
+        if not missing:
+            return known
 
-        # Build SPARQL query for all Q-IDs
-        values = " ".join(f"wd:{qid}" for qid in qids)
+        # Build SPARQL query for the remaining Q-IDs
+        values = " ".join(f"wd:{qid}" for qid in missing)
         query = f"""
 SELECT ?item ?osmRelation WHERE {{
   VALUES ?item {{ {values} }}
@@ -141,15 +303,18 @@ SELECT ?item ?osmRelation WHERE {{
 }}
 """
 
-        try:
-            resp = self._session.get(
-                self.SPARQL_ENDPOINT,
-                params={"query": query, "format": "json"},
-                timeout=30,
-            )
+        data = self.get_json(
+            self.SPARQL_ENDPOINT,
+            params={"query": query, "format": "json"},
+            timeout=30,
+        )
+
+        if data is None:
+            self.logger.debug("SPARQL batch query failed")
+            return {qid: known.get(qid) for qid in qids}
 
-            data = resp.json()
-            results: dict[str, int | None] = {qid: None for qid in qids}
+        try:
+            results: dict[str, int | None] = {qid: known.get(qid) for qid in qids}
 
             for binding in data.get("results", {}).get("bindings", []):
                 item_uri = binding.get("item", {}).get("value", "")
@@ -161,8 +326,10 @@ SELECT ?item ?osmRelation WHERE {{
                     except (ValueError, KeyError):
                         pass
 
+            self._p402.update((qid, results[qid]) for qid in missing)
+
             return results
 
-        except (requests.RequestException, KeyError, ValueError) as e:
-            self.logger.debug(f"SPARQL batch query failed: {e}")
-            return {qid: None for qid in qids}
+        except (KeyError, ValueError) as e:
+            self.logger.debug("SPARQL batch query failed: %s", e)
+            return {qid: known.get(qid) for qid in qids}
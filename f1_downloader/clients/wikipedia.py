@@ -7,8 +7,8 @@ import re
 from io import StringIO
 from typing import TYPE_CHECKING
 
+import lxml.html
 import pandas as pd
-import requests
 
 if TYPE_CHECKING:
     from f1_downloader.config import Config
@@ -16,24 +16,35 @@ if TYPE_CHECKING:
 from f1_downloader.models import Circuit
 
 
-def _clean_wiki_text(text: object) -> str:
-    """Remove Wikipedia annotations from text."""
-    if text is None or (isinstance(text, float) and pd.isna(text)):
-        return ""
-    text_str = str(text)
-    text_str = re.sub(r"\[.*?\]", "", text_str)
-    text_str = re.sub(r"[*\u2020\u2021\u00a7\u00b6]", "", text_str)
-    return text_str.strip()
+_WIKI_REFS_RE = re.compile(r"\[.*?\]")
+_WIKI_MARKS_RE = re.compile(r"[*\u2020\u2021\u00a7\u00b6]")
+
+
+def _clean_wiki_column(column: pd.Series) -> pd.Series:
+    """Remove Wikipedia annotations from a whole table column."""
+    return (
+        column.astype("string")
+        .str.replace(_WIKI_REFS_RE, "", regex=True)
+        .str.replace(_WIKI_MARKS_RE, "", regex=True)
+        .str.strip()
+        .fillna("")
+    )
 
 
 class WikipediaClient:
     """Client for fetching F1 circuit data from Wikipedia."""
 
+    # Only tables with the columns we need are handed to pandas
+    TABLE_XPATH = (
+        "//table[.//th[normalize-space()='Circuit']"
+        " and .//th[normalize-space()='Location']"
+        " and .//th[normalize-space()='Country']]"
+    )
+
     def __init__(self, config: Config, logger: logging.Logger) -> None:
         self.config = config
         self.logger = logger
-        self._session = requests.Session()
-        self._session.headers.update(config.headers)
+        self._session = config.session
 
     def fetch_circuits(self) -> list[Circuit]:
         """Fetch list of F1 circuits from Wikipedia."""
@@ -47,33 +58,43 @@ class WikipediaClient:
 
         resp.raise_for_status()
 
-        tables = pd.read_html(StringIO(resp.text))
+        # Pre-select candidate tables, fall back to the whole page if the layout changed
+        parser = lxml.html.HTMLParser(encoding=resp.encoding or "utf-8")
+        candidates = lxml.html.fromstring(resp.content, parser=parser).xpath(self.TABLE_XPATH)
+        source = (
+            "".join(lxml.html.tostring(table, encoding="unicode") for table in candidates)
+            if candidates
+            else resp.text
+        )
+
+        tables = pd.read_html(StringIO(source))
         circuits: list[Circuit] = []
 
         for table in tables:
             cols = set(table.columns)
 
             if {"Circuit", "Location", "Country"} <= cols:
-                for _, row in table.iterrows():
-                    name = _clean_wiki_text(row["Circuit"])
-
-                    if name:
-                        # Extract "Grands Prix" column if available
-                        grands_prix = ""
+                # "Grands Prix" column is optional
+                if "Grands Prix" not in cols:
+                    table["Grands Prix"] = ""
 
-                        if "Grands Prix" in cols:
-                            grands_prix = _clean_wiki_text(row["Grands Prix"])
+                columns = ["Circuit", "Location", "Country", "Grands Prix"]
+                cleaned = table[columns].apply(_clean_wiki_column)
 
+                for name, location, country, grands_prix in cleaned.itertuples(
+                    index=False, name=None
+                ):
+                    if name:
                         circuits.append(
                             Circuit(
                                 name=name,
-                                location=_clean_wiki_text(row["Location"]),
-                                country=_clean_wiki_text(row["Country"]),
+                                location=location,
+                                country=country,
                                 grands_prix=grands_prix,
                             )
                         )
                 break
 
-        self.logger.info(f"   Found {len(circuits)} circuits")
+        self.logger.info("   Found %s circuits", len(circuits))
 
         return circuits
@@ -1,8 +1,14 @@
 """Configuration for F1 Track Downloader."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    import requests
 
 
 @dataclass
@@ -13,13 +19,26 @@ class Config:
     output_dir: Path = field(default_factory=lambda: Path("tracks_geojson"))
     log_dir: Path = field(default_factory=lambda: Path("logs"))
     mappings_file: Path = field(default_factory=lambda: Path("circuit_mappings.json"))
+    cache_dir: Path = field(default_factory=lambda: Path(".cache"))
 
     # HTTP settings
     user_agent: str = "F1TrackDownloader/1.0"
-    request_delay: float = 1.0
+    request_delay: float = 1.0  # Minimum delay between requests to one host
+    max_request_delay: float = 60.0  # Upper bound when backing off after 429
     timeout: int = 30
     max_retries: int = 3
     retry_delay: int = 5
+    workers: int = 8  # Circuits processed in parallel
+
+    # Cache settings
+    cache_flush_interval: int = 10  # Flush cache journal every N circuits
+    http_cache_days: int = 7  # HTTP response cache lifetime (needs requests-cache)
+    geometry_cache_days: int = 7  # Per-version geometry cache lifetime
+    json_cache_days: int = 30  # Wikidata/SPARQL result cache lifetime
+
+    # Overpass per-server token bucket (requests/second, burst size)
+    overpass_rate: float = 1.0
+    overpass_burst: int = 3
 
     # API endpoints
     wikipedia_url: str = "https://en.wikipedia.org/wiki/List_of_Formula_One_circuits"
@@ -40,7 +59,15 @@ class Config:
         """HTTP headers for requests."""
         return {"User-Agent": self.user_agent}
 
+    @cached_property
+    def session(self) -> requests.Session:
+        """HTTP session shared by all clients (one keep-alive pool per host)."""
+        from f1_downloader.clients.http import create_session
+
+        return create_session(self)
+
     def ensure_dirs(self) -> None:
-        """Create output and log directories if they don't exist."""
+        """Create output, log and cache directories if they don't exist."""
         self.output_dir.mkdir(exist_ok=True)
         self.log_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(exist_ok=True)
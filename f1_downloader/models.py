@@ -4,10 +4,22 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Literal
 
+_FILENAME_SPECIAL_RE = re.compile(r"[^\w\s-]")
+_FILENAME_SEPARATOR_RE = re.compile(r"[\s-]+")
+
+# ASCII folding of Latin-1 and Latin Extended-A letters (what NFKD + ASCII
+# encoding gives), covers nearly all circuit names without unicodedata lookups
+_ASCII_FOLD = str.maketrans(
+    {
+        char: unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")
+        for char in map(chr, range(0xC0, 0x180))
+    }
+)
+
 
 @dataclass
 class Circuit:
@@ -18,20 +30,24 @@ class Circuit:
     country: str
     grands_prix: str = ""
 
-    @property
+    @cached_property
     def safe_filename(self) -> str:
-        """Convert name to filesystem-safe filename."""
+        """Convert name to filesystem-safe filename (computed once)."""
+
+        ascii_only = self.name.translate(_ASCII_FOLD)
 
-        normalized = unicodedata.normalize("NFKD", self.name)
-        ascii_only = normalized.encode("ascii", "ignore").decode("ascii")
-        no_special = re.sub(r"[^\w\s-]", "", ascii_only)
+        # Characters outside the table: full Unicode normalization
+        if not ascii_only.isascii():
+            normalized = unicodedata.normalize("NFKD", ascii_only)
+            ascii_only = normalized.encode("ascii", "ignore").decode("ascii")
+        no_special = _FILENAME_SPECIAL_RE.sub("", ascii_only)
 
-        return re.sub(r"[\s-]+", "_", no_special).strip("_")
+        return _FILENAME_SEPARATOR_RE.sub("_", no_special).strip("_")
 
-    @property
+    @cached_property
     def search_names(self) -> list[str]:
         """
-        Generate alternative names for searching.
+        Generate alternative names for searching (computed once).
         """
 
         names = [self.name]
@@ -45,7 +61,13 @@ class Circuit:
                 if gp_name:
                     names.append(gp_name)
 
-        return names
+        # Drop repeats (ignoring case), each name costs a Wikidata search
+        unique: dict[str, str] = {}
+
+        for name in names:
+            unique.setdefault(name.strip().casefold(), name)
+
+        return list(unique.values())
 
 
 OsmType = Literal["relation", "way"]
@@ -59,6 +81,7 @@ class SearchResult:
     osm_type: OsmType
     method: str
     wikidata_id: str | None = None
+    osm_version: int | None = None  # Set when already known from verification
 
 
 @dataclass
@@ -70,9 +93,7 @@ class CacheEntry:
     wikidata_id: str | None = None
     search_method: str | None = None
     search_name: str | None = None
-    verified_at: str = field(
-        default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M")
-    )
+    verified_at: str = ""  # Set by CircuitCache.set()
     manual: bool = False
     comment: str | None = None
     osm_version: int | None = None
@@ -0,0 +1,149 @@
+"""Thread-safe rate limiting for API clients."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+
+
+class AdaptiveLimiter:
+    """
+    Enforce a per-host delay between requests that follows server feedback.
+
+    Each host keeps its own schedule, so threads talking to different
+    services don't wait on each other. The delay starts at min_delay,
+    doubles (or jumps to Retry-After) on 429 and decays by 10% after each
+    successful response, within [min_delay, max_delay].
+    """
+
+    def __init__(self, min_delay: float, max_delay: float) -> None:
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+        self._current: dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        """Block until a request to host is allowed."""
+
+        # Reserve a slot under the lock, sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self._current.get(host, self.min_delay)
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    def success(self, host: str) -> None:
+        """Speed up after a successful response."""
+
+        with self._lock:
+            current = self._current.get(host, self.min_delay)
+            self._current[host] = max(self.min_delay, current * 0.9)
+
+    def throttle(self, host: str, retry_after: float | None = None) -> None:
+        """Slow down after a rate limit response, honoring Retry-After."""
+
+        with self._lock:
+            current = self._current.get(host, self.min_delay)
+            delay = min(self.max_delay, max(current * 2, retry_after or 1.0))
+            self._current[host] = delay
+            # Push back requests already scheduled for this host
+            self._next_slot[host] = max(
+                self._next_slot.get(host, 0.0),
+                time.monotonic() + delay,
+            )
+
+    def observe(self, host: str, status: int, headers: Mapping[str, str]) -> None:
+        """Adjust the delay for host from a response status and headers."""
+
+        if status == 429:
+            self.throttle(host, parse_retry_after(headers.get("Retry-After")))
+        elif headers.get("RateLimit-Remaining") == "0":
+            # Quota exhausted: wait for the window to reset before the next call
+            self.throttle(host, parse_retry_after(headers.get("RateLimit-Reset")))
+        elif status < 400:
+            self.success(host)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with adaptive refill rate.
+
+    Bursts of up to `burst` requests go through immediately, then requests
+    are paced at `rate` per second. penalize() halves the rate (and honors
+    Retry-After), reward() recovers it gradually after successful requests.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def consume(self, tokens: float = 1) -> bool:
+        """
+        Take tokens from the bucket without waiting.
+
+        Returns False if not enough tokens are available, delay() tells
+        how long until they are.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now >= self._blocked_until and self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+
+            return False
+
+    def delay(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` could be consumed (0 if available now)."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            return max(
+                self._blocked_until - now,
+                (tokens - self._tokens) / self.rate,
+                0.0,
+            )
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """Slow down after a rate limit response."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def reward(self) -> None:
+        """Recover rate after a successful request."""
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate * 1.5)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse Retry-After header given in seconds (HTTP dates are ignored)."""
+
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
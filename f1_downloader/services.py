@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -12,7 +13,10 @@ from f1_downloader.clients.osm import OsmClient
 from f1_downloader.clients.overpass import OverpassClient
 from f1_downloader.clients.wikidata import WikidataClient
 from f1_downloader.models import Circuit, ProcessResult, SearchResult
-from f1_downloader.utils import atomic_write
+from f1_downloader.utils import atomic_write, json_dumps, same_content
+
+# Overpass geometry point -> GeoJSON position (tuples serialize as arrays)
+_lon_lat = itemgetter("lon", "lat")
 
 
 @dataclass
@@ -28,6 +32,80 @@ class _Candidate:
     from_circuit_name: bool = False  # True if Q-ID found via circuit name (not Grand Prix)
 
 
+@dataclass
+class Prefetched:
+    """Lookups done once for all circuits before processing them."""
+
+    qids_by_name: dict[str, list[str]] = field(default_factory=dict)
+    osm_by_qid: dict[str, tuple[int | None, str | None, int]] = field(default_factory=dict)
+    # (osm_id, osm_type) -> (exists, version) for cached OSM IDs
+    osm_status: dict[tuple[int, str], tuple[bool, int | None]] = field(default_factory=dict)
+
+
+def _will_process(circuit: Circuit, output_dir: Path, check_update: bool) -> bool:
+    """Check if process_circuit() won't skip the circuit right away."""
+
+    out_path = output_dir / f"{circuit.safe_filename}.geojson"
+
+    return check_update or not out_path.exists()
+
+
+def _needs_search(circuit: Circuit, cache: CircuitCache) -> bool:
+    """Check if the circuit has no cached OSM ID and no manual entry."""
+
+    cached = cache.get(circuit.name)
+
+    return not (cached and (cached.osm_id or cached.manual))
+
+
+def prefetch_lookups(
+    circuits: list[Circuit],
+    output_dir: Path,
+    cache: CircuitCache,
+    wikidata: WikidataClient,
+    overpass: OverpassClient,
+    osm: OsmClient,
+    logger: logging.Logger,
+    check_update: bool = False,
+) -> Prefetched:
+    """
+    Resolve Q-IDs for all uncached circuits and search OSM for all of
+    their wikidata tags in batched Overpass queries (instead of one per
+    circuit). Q-IDs whose batch failed are searched again per circuit.
+    Cached OSM IDs are verified with batched OSM API requests.
+    """
+
+    prefetched = Prefetched()
+    to_process = [c for c in circuits if _will_process(c, output_dir, check_update)]
+    pending = [c for c in to_process if _needs_search(c, cache)]
+
+    cached_ids = [
+        (entry.osm_id, entry.osm_type or "relation")
+        for entry in (cache.get(c.name) for c in to_process)
+        if entry and entry.osm_id
+    ]
+
+    if cached_ids:
+        logger.info("Verifying %s cached OSM IDs...", len(cached_ids))
+        prefetched.osm_status = osm.fetch_batch(cached_ids)
+
+    if not pending:
+        return prefetched
+
+    logger.info("Prefetching Wikidata Q-IDs for %s circuits...", len(pending))
+
+    names = [name for circuit in pending for name in circuit.search_names]
+    prefetched.qids_by_name = wikidata.find_ids_batch(names)
+
+    qids = list(dict.fromkeys(q for ids in prefetched.qids_by_name.values() for q in ids))
+
+    if qids:
+        logger.info("Batch searching OSM for %s wikidata tags...", len(qids))
+        prefetched.osm_by_qid = overpass.find_by_wikidata_tags_batch(qids)
+
+    return prefetched
+
+
 def search_osm_id(
     circuit: Circuit,
     cache: CircuitCache,
@@ -35,10 +113,14 @@ def search_osm_id(
     overpass: OverpassClient,
     osm: OsmClient,
     logger: logging.Logger,
+    prefetched: Prefetched | None = None,
 ) -> SearchResult | None:
     """
     Find OSM element ID using cache and Wikidata.
 
+    Q-IDs and wikidata tag matches found in prefetched are reused
+    instead of being requested again.
+
     Search order:
     1. Check cache
     2. Collect all Q-IDs from all name variants
@@ -64,19 +146,23 @@ def search_osm_id(
 
         # Verify cached ID still exists
         if osm_id:
-            if osm.verify_exists(osm_id, osm_type):
+            status = prefetched.osm_status.get((osm_id, osm_type)) if prefetched else None
+            exists, version = status or osm.fetch(osm_id, osm_type)
+
+            if exists:
                 method = cached.search_method or "cached"
 
-                logger.info(f"    Cache hit: OSM {osm_type} {osm_id} (via {method})")
+                logger.info("    Cache hit: OSM %s %s (via %s)", osm_type, osm_id, method)
 
                 return SearchResult(
                     osm_id=osm_id,
                     osm_type=osm_type,  # type: ignore
                     method=f"cache ({method})",
                     wikidata_id=cached.wikidata_id,
+                    osm_version=version,
                 )
             else:
-                logger.warning(f"    Cached OSM ID {osm_id} no longer exists!")
+                logger.warning("    Cached OSM ID %s no longer exists!", osm_id)
 
     # Step 1: Collect all Q-IDs from all search names
     logger.info("    Step 1: Collecting Q-IDs from Wikidata...")
@@ -84,14 +170,19 @@ def search_osm_id(
     all_qids: dict[str, str] = {}  # qid -> search_name that found it
     circuit_name_qids: set[str] = set()  # Q-IDs found via circuit name (first search_name)
 
+    # Look up names missing from prefetch in one SPARQL query
+    known = prefetched.qids_by_name if prefetched else {}
+    qids_by_name = {n: known[n] for n in circuit.search_names if n in known}
+    missing_names = [n for n in circuit.search_names if n not in qids_by_name]
+    qids_by_name.update(wikidata.find_ids_batch(missing_names))
+
     for i, search_name in enumerate(circuit.search_names):
-        logger.info(f'       Searching for "{search_name}"...')
-        qids = wikidata.find_ids(search_name)
+        logger.info('       Searching for "%s"...', search_name)
 
-        for qid in qids:
+        for qid in qids_by_name[search_name]:
             if qid not in all_qids:
                 all_qids[qid] = search_name
-                logger.info(f"          -> {qid}")
+                logger.debug("          -> %s", qid)
 
                 # Track Q-IDs found via circuit name (not Grand Prix)
                 if i == 0:
@@ -106,14 +197,14 @@ def search_osm_id(
 
     if all_qids:
         qid_list = list(all_qids.keys())
-        logger.info(f"    Step 2: Batch checking P402 for {len(qid_list)} Q-IDs...")
+        logger.info("    Step 2: Batch checking P402 for %s Q-IDs...", len(qid_list))
         p402_results = wikidata.get_p402_batch(qid_list)
 
         for qid, p402_id in p402_results.items():
             if p402_id and p402_id not in checked_osm_ids:
                 checked_osm_ids.add(p402_id)
                 search_name = all_qids[qid]
-                logger.info(f"       -> {qid}: P402 found: relation {p402_id}")
+                logger.info("       -> %s: P402 found: relation %s", qid, p402_id)
 
                 # P402 is always a relation, get its score (will be cached)
                 element_data, _ = overpass.get_geometry(p402_id, "relation")
@@ -131,15 +222,28 @@ def search_osm_id(
                     )
                 )
 
-        # Step 3: Batch search OSM for wikidata tags (one Overpass request)
-        logger.info(f"    Step 3: Batch searching OSM for {len(qid_list)} wikidata tags...")
-        osm_results = overpass.find_by_wikidata_tags_batch(qid_list)
+        # Step 3: Batch search OSM for wikidata tags the prefetch didn't cover
+        osm_results = {
+            qid: prefetched.osm_by_qid[qid]
+            for qid in qid_list
+            if prefetched and qid in prefetched.osm_by_qid
+        }
+        missing = [qid for qid in qid_list if qid not in osm_results]
+
+        if missing:
+            logger.info("    Step 3: Batch searching OSM for %s wikidata tags...", len(missing))
+            osm_results.update(overpass.find_by_wikidata_tags_batch(missing))
+        else:
+            logger.info(
+                "    Step 3: Using prefetched OSM results for %s wikidata tags",
+                len(qid_list),
+            )
 
         for qid, (osm_id, osm_type, score) in osm_results.items():
             if osm_id and osm_type and osm_id not in checked_osm_ids:
                 checked_osm_ids.add(osm_id)
                 search_name = all_qids[qid]
-                logger.info(f"       -> {qid}: found {osm_type} {osm_id} (score={score})")
+                logger.info("       -> %s: found %s %s (score=%s)", qid, osm_type, osm_id, score)
 
                 candidates.append(
                     _Candidate(
@@ -164,12 +268,12 @@ def search_osm_id(
         # Only search by circuit name (first search_name), not Grand Prix names
         # This reduces API load significantly
         search_name = circuit.search_names[0] if circuit.search_names else circuit.name
-        logger.info(f'    Step 4: Trying OSM name search for "{search_name}"...')
+        logger.info('    Step 4: Trying OSM name search for "%s"...', search_name)
         osm_id, osm_type, server = overpass.find_by_name(search_name)
 
         if osm_id and osm_type and osm_id not in checked_osm_ids:
             checked_osm_ids.add(osm_id)
-            logger.info(f"       -> found {osm_type} {osm_id} (via {server})")
+            logger.info("       -> found %s %s (via %s)", osm_type, osm_id, server)
 
             # Get score for this element
             element_data, _ = overpass.get_geometry(osm_id, osm_type)
@@ -187,7 +291,7 @@ def search_osm_id(
                 )
             )
         elif osm_id and osm_id in checked_osm_ids:
-            logger.info(f"       -> {osm_type} {osm_id} already in candidates")
+            logger.info("       -> %s %s already in candidates", osm_type, osm_id)
         else:
             logger.info("       -> not found")
 
@@ -198,9 +302,13 @@ def search_osm_id(
         best = candidates[0]
 
         logger.info(
-            f"    Found {len(candidates)} candidate(s), "
-            f"best: {best.osm_type} {best.osm_id} (score={best.score}, "
-            f"from_circuit_name={best.from_circuit_name}, method={best.method})"
+            "    Found %s candidate(s), best: %s %s (score=%s, from_circuit_name=%s, method=%s)",
+            len(candidates),
+            best.osm_type,
+            best.osm_id,
+            best.score,
+            best.from_circuit_name,
+            best.method,
         )
 
         # Build comment if multiple candidates
@@ -212,7 +320,7 @@ def search_osm_id(
                 for c in candidates[1:]
             ]
             comment = f"Also found: {', '.join(others)}. Please verify manually."
-            logger.warning(f"    Multiple candidates found: {comment}")
+            logger.warning("    Multiple candidates found: %s", comment)
 
         cache.set(
             circuit.name,
@@ -258,7 +366,7 @@ def element_to_geojson(element: dict[str, Any]) -> dict[str, Any]:
         # Relation: geometry is in members
         for member in element.get("members", []):
             if member["type"] == "way" and "geometry" in member:
-                coords = [[p["lon"], p["lat"]] for p in member["geometry"]]
+                coords = list(map(_lon_lat, member["geometry"]))
                 features.append(
                     {
                         "type": "Feature",
@@ -272,7 +380,7 @@ def element_to_geojson(element: dict[str, Any]) -> dict[str, Any]:
     elif osm_type == "way":
         # Way: geometry is directly in element
         if "geometry" in element:
-            coords = [[p["lon"], p["lat"]] for p in element["geometry"]]
+            coords = list(map(_lon_lat, element["geometry"]))
             features.append(
                 {
                     "type": "Feature",
@@ -296,6 +404,7 @@ def process_circuit(
     osm: OsmClient,
     logger: logging.Logger,
     check_update: bool = False,
+    prefetched: Prefetched | None = None,
 ) -> ProcessResult:
     """Process a single circuit and save its geometry."""
 
@@ -310,7 +419,7 @@ def process_circuit(
         )
 
     # Find OSM ID
-    result = search_osm_id(circuit, cache, wikidata, overpass, osm, logger)
+    result = search_osm_id(circuit, cache, wikidata, overpass, osm, logger, prefetched)
 
     if not result:
         # Check if it was a manual skip
@@ -354,7 +463,7 @@ def process_circuit(
     if out_path.exists() and check_update:
         cached = cache.get(circuit.name)
         local_ver = cached.osm_version if cached else None
-        remote_ver = osm.get_version(result.osm_id, result.osm_type)
+        remote_ver = result.osm_version or osm.get_version(result.osm_id, result.osm_type)
 
         if local_ver and remote_ver and local_ver >= remote_ver:
             return ProcessResult(
@@ -363,10 +472,17 @@ def process_circuit(
                 is_skipped=True,
             )
 
-        logger.info(f"    Updating: v{local_ver} -> v{remote_ver}")
+        logger.info("    Updating: v%s -> v%s", local_ver, remote_ver)
+
+    # Get geometry (fresh when updating to a newer OSM version)
+    updating = remote_ver is not None
 
-    # Get geometry
-    element, server = overpass.get_geometry(result.osm_id, result.osm_type)
+    if remote_ver is None:
+        remote_ver = result.osm_version or osm.get_version(result.osm_id, result.osm_type)
+
+    element, server = overpass.get_geometry(
+        result.osm_id, result.osm_type, use_cache=not updating, version=remote_ver
+    )
 
     if not element:
         return ProcessResult(
@@ -397,11 +513,22 @@ def process_circuit(
             ),
         )
 
-    if atomic_write(geojson, out_path, logger):
-        # Update version in cache
-        if remote_ver is None:
-            remote_ver = osm.get_version(result.osm_id, result.osm_type)
+    # Serialized once, for both the comparison and the write
+    payload = json_dumps(geojson, indent=True)
+
+    # Geometry didn't change (e.g. only tags did): keep the file as is
+    if out_path.exists() and same_content(payload, out_path):
+        if remote_ver:
+            cache.update_version(circuit.name, remote_ver)
 
+        return ProcessResult(
+            success=True,
+            message="Up to date (content identical)",
+            is_skipped=True,
+        )
+
+    if atomic_write(payload, out_path, logger):
+        # Update version in cache
         if remote_ver:
             cache.update_version(circuit.name, remote_ver)
 
@@ -2,17 +2,71 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
 import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from typing import Any, TYPE_CHECKING
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, stdlib json works too
+    orjson = None
+
 if TYPE_CHECKING:
     from f1_downloader.config import Config
 
 
+def json_loads(raw: bytes | str) -> Any:
+    """Parse JSON, using orjson when available."""
+
+    if orjson is not None:
+        return orjson.loads(raw)
+
+    return json.loads(raw)
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+
+    if orjson is not None:
+        # Non-str keys are stringified like stdlib json does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+# Circuit being processed by the current thread, prefixed to its log lines
+_log_context: ContextVar[str] = ContextVar("log_context", default="")
+
+
+class _ContextFilter(logging.Filter):
+    """Stamp records with the circuit of the thread that emitted them."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _log_context.get()
+        return True
+
+
+@contextmanager
+def log_context(label: str) -> Iterator[None]:
+    """Prefix log lines emitted in this block with [label]."""
+
+    token = _log_context.set(f"[{label}] ")
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
 def setup_logging(config: Config) -> logging.Logger:
     """Setup logging to console and file."""
 
@@ -22,49 +76,72 @@ def setup_logging(config: Config) -> logging.Logger:
 
     logger = logging.getLogger("f1downloader")
     logger.setLevel(logging.INFO)
+    logger.propagate = False  # Own handlers only, skip the root logger
 
     # Clear existing handlers
     logger.handlers.clear()
+    logger.filters.clear()
+
+    # Workers interleave, tag each record with its circuit at emit time
+    logger.addFilter(_ContextFilter())
 
     # Console handler
     console = logging.StreamHandler()
-    console.setFormatter(logging.Formatter("%(message)s"))
+    console.setFormatter(logging.Formatter("%(context)s%(message)s"))
     logger.addHandler(console)
 
-    # File handler
+    # File handler, buffered: written every 1024 records or on an error
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%H:%M:%S"))
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(context)s%(message)s", "%H:%M:%S"))
+    buffered = MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+    logger.addHandler(buffered)
+    atexit.register(buffered.flush)
 
     return logger
 
 
-def atomic_write(data: dict[str, Any], path: Path, logger: logging.Logger) -> bool:
+def same_content(payload: bytes, path: Path) -> bool:
+    """Check if path already holds exactly payload."""
+
+    try:
+        current = path.read_bytes()
+    except OSError:
+        return False
+
+    return current == payload
+
+
+def atomic_write(data: dict[str, Any] | bytes, path: Path, logger: logging.Logger) -> bool:
     """
     Atomically write JSON to file.
 
-    Uses temp file + rename to prevent corruption on interruption.
+    data is either a dict or JSON already encoded with json_dumps(indent=True).
+    Uses temp file + replace to prevent corruption on interruption,
+    the data is fsynced before it replaces the old file.
     """
+    payload = data if isinstance(data, bytes) else json_dumps(data, indent=True)
     path.parent.mkdir(exist_ok=True)
     tmp_path: Path | None = None
 
     try:
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            suffix=".geojson",
+            mode="wb",
+            suffix=path.suffix,
             dir=path.parent,
             delete=False,
-            encoding="utf-8",
         ) as tmp:
-            json.dump(data, tmp, ensure_ascii=False, indent=2)
             tmp_path = Path(tmp.name)
+            tmp.write(payload)
+            tmp.flush()
+            os.fsync(tmp.fileno())
 
-        tmp_path.rename(path)
+        # replace() overwrites an existing file atomically on Windows too
+        tmp_path.replace(path)
 
         return True
 
     except Exception as e:
-        logger.error(f"    Write error: {e}")
+        logger.error("    Write error: %s", e)
 
         if tmp_path and tmp_path.exists():
             tmp_path.unlink()
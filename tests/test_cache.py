@@ -0,0 +1,81 @@
+"""Tests for the circuit mappings cache."""
+
+import logging
+
+from f1_downloader.cache import CircuitCache
+from f1_downloader.utils import json_loads
+
+logger = logging.getLogger("f1downloader.tests")
+
+
+def test_missing_file_journal_replay_and_compact(tmp_path):
+    path = tmp_path / "circuit_mappings.json"
+
+    # First run: no mappings file yet
+    cache = CircuitCache(path, logger)
+
+    assert path.exists()
+    assert json_loads(path.read_bytes())["circuits"] == {}
+
+    cache.set("Albert Park Circuit", 123, "relation", wikidata_id="Q1", method="P402")
+    cache.update_version("Albert Park Circuit", 7)
+    cache.flush()
+
+    # Mutations live in the journal until compaction
+    assert cache.journal_path.exists()
+    assert json_loads(path.read_bytes())["circuits"] == {}
+
+    # Next run replays the journal (lookup is case-insensitive)
+    replayed = CircuitCache(path, logger)
+    entry = replayed.get("albert park circuit")
+
+    assert entry is not None
+    assert entry.osm_id == 123
+    assert entry.osm_version == 7
+
+    replayed.compact()
+
+    assert not replayed.journal_path.exists()
+    circuits = json_loads(path.read_bytes())["circuits"]
+    assert circuits["Albert Park Circuit"]["osm_id"] == 123
+    assert circuits["Albert Park Circuit"]["osm_version"] == 7
+
+
+def test_writes_resolve_names_case_insensitively(tmp_path):
+    path = tmp_path / "circuit_mappings.json"
+    path.write_text('{"circuits": {"Circuit de monaco": {"osm_id": 1, "manual": true}}}')
+    cache = CircuitCache(path, logger)
+
+    cache.update_version("Circuit de Monaco", 5)
+    cache.set("Circuit de Monaco", 2, "way")
+
+    entry = cache.get("Circuit de Monaco")
+
+    assert entry is not None
+    assert entry.osm_id == 1  # Manual entry kept
+    assert entry.osm_version == 5
+
+    cache.compact()
+
+    assert list(json_loads(path.read_bytes())["circuits"]) == ["Circuit de monaco"]
+
+
+def test_journal_survives_torn_and_nameless_records(tmp_path):
+    path = tmp_path / "circuit_mappings.json"
+    cache = CircuitCache(path, logger)
+    cache.set("A", 1, "way")
+    cache.set("B", 2, "way")
+    cache.flush()
+
+    # Crash mid-write: last record torn, plus a record without a name
+    with open(cache.journal_path, "ab") as f:
+        f.write(b'{"osm_id": 3}\n{"name": "Torn", "osm_')
+
+    resumed = CircuitCache(path, logger)
+    resumed.set("C", 3, "way")
+    resumed.flush()
+
+    replayed = CircuitCache(path, logger)
+
+    assert [replayed.get(name).osm_id for name in ("A", "B", "C")] == [1, 2, 3]
+    assert replayed.get("Torn") is None